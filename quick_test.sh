@@ -1,7 +1,11 @@
 #!/bin/bash
 
 # RTX 3090 Quick Test - Main Script
-# Usage: bash quick_test.sh
+# Usage: bash quick_test.sh [--triage]
+#   --triage  Run cheap checks first and stop at the first FAIL (tests/triage.py)
+#
+# Without hardware: GPU_BACKEND=sim [GPU_SIM_FAULTS=bitflip,...] bash quick_test.sh
+#   (simulated card, time-compressed - see tests/gpu_backend.py)
 
 set -e
 
@@ -30,7 +34,9 @@ echo -e "${NC}"
 # Check requirements
 echo "Checking requirements..."
 
-if ! command -v nvidia-smi &> /dev/null; then
+if [ "$GPU_BACKEND" = "sim" ]; then
+    echo -e "${YELLOW}⚠️  Simulated GPU backend (GPU_BACKEND=sim) - results are not from real hardware${NC}"
+elif ! command -v nvidia-smi &> /dev/null; then
     echo -e "${RED}❌ nvidia-smi not found. Install NVIDIA drivers first.${NC}"
     exit 1
 fi
@@ -47,13 +53,25 @@ if ! python3 -c "import torch" &> /dev/null; then
     exit 1
 fi
 
-if ! python3 -c "import torch; assert torch.cuda.is_available()" &> /dev/null; then
+if [ "$GPU_BACKEND" != "sim" ] && ! python3 -c "import torch; assert torch.cuda.is_available()" &> /dev/null; then
     echo -e "${RED}❌ CUDA not available in PyTorch.${NC}"
     exit 1
 fi
 
 echo -e "${GREEN}✓ All requirements met${NC}\n"
 
+# Tiered triage: stops early on a definitive FAIL
+if [ "$1" = "--triage" ]; then
+    set +e
+    python3 tests/triage.py
+    EXIT_CODE=$?
+    set -e
+    if [ $EXIT_CODE -eq 2 ]; then
+        exit 0  # Warnings are acceptable, same as the full run
+    fi
+    exit $EXIT_CODE
+fi
+
 # Start tests
 echo "═══════════════════════════════════════════════════════════"
 echo "                    STARTING TESTS"
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Bench Agent - Run card tests for a bench coordinator on this PC
+
+Connects to bench_coordinator.py, registers the local GPU slots and runs
+each job it receives as the usual test scripts, pinned to the job's slot
+with CUDA_VISIBLE_DEVICES (in PCI bus order, matching nvidia-smi) and
+GPU_INDEX for nvidia-smi queries. Test output is streamed back line by line.
+With --fake the agent reports fake slots and runs dummy tests, so several
+agents can be exercised on one machine without any GPU.
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from bench_coordinator import LineSocket, DEFAULT_PORT, DEFAULT_TESTS
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scripts a coordinator may ask for - anything else is refused, since the
+# coordinator is not authenticated
+ALLOWED_SCRIPTS = {spec[0] for _, spec in DEFAULT_TESTS} | {"triage.py", "combined_test.py"}
+
+# Stand-in for a test script in --fake mode: argv = [name, seconds, exit_code]
+FAKE_TEST = """
+import sys, time
+name, seconds, code = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+print(f"FAKE {name} starting", flush=True)
+time.sleep(seconds)
+print(f"FAKE {name} finished (exit {code})", flush=True)
+sys.exit(code)
+"""
+
+def detect_slots():
+    """List local GPU indices via nvidia-smi"""
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=index", "--format=csv,noheader"],
+            capture_output=True, text=True, check=True
+        )
+        return [int(line) for line in result.stdout.split()]
+    except:
+        return []
+
+class Agent:
+    """One connection to the coordinator plus the jobs running on it"""
+
+    def __init__(self, name, slots, fake_seconds=None, fake_fail=()):
+        self.name = name
+        self.slots = slots
+        self.fake_seconds = fake_seconds
+        self.fake_fail = set(fake_fail)
+        self.conn = None
+        self.processes = {}  # slot -> running Popen
+        self.cancelled = set()  # job_ids the coordinator gave up on
+        self.lock = threading.Lock()
+
+    def test_command(self, name, spec):
+        if self.fake_seconds is not None:
+            code = 1 if name in self.fake_fail else 0
+            return [sys.executable, "-c", FAKE_TEST, name, str(self.fake_seconds), str(code)]
+        script, *args = spec
+        if script not in ALLOWED_SCRIPTS:
+            raise ValueError(f"script not allowed: {script}")
+        return [sys.executable, os.path.join(TESTS_DIR, script), *args]
+
+    def run_job(self, job):
+        """Run every test of a job in order, streaming output to the coordinator"""
+        job_id = job['job_id']
+        slot = job['slot']
+        # Slots are nvidia-smi indices (PCI bus order); CUDA defaults to fastest-first
+        env = dict(os.environ,
+                   CUDA_DEVICE_ORDER="PCI_BUS_ID",
+                   CUDA_VISIBLE_DEVICES=str(slot),
+                   GPU_INDEX=str(slot),
+                   PYTHONUNBUFFERED="1")
+
+        print(f"▶️  Job {job_id}: {job['card']} on slot {slot}")
+        try:
+            for name, spec in job['tests']:
+                try:
+                    command = self.test_command(name, spec)
+                except ValueError as e:
+                    print(f"❌ Job {job_id}: {name} refused ({str(e)})")
+                    self.conn.send({'type': 'output', 'job_id': job_id, 'line': f"❌ Refused: {str(e)}"})
+                    self.conn.send({'type': 'result', 'job_id': job_id, 'test': name, 'exit_code': 1})
+                    continue
+
+                with self.lock:
+                    if job_id in self.cancelled:
+                        self.confirm_cancel(job)
+                        return
+                    process = subprocess.Popen(command, env=env,
+                                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                               text=True, cwd=os.path.dirname(TESTS_DIR))
+                    self.processes[slot] = process
+
+                for line in process.stdout:
+                    self.conn.send({'type': 'output', 'job_id': job_id, 'line': line.rstrip()})
+                exit_code = process.wait()
+
+                with self.lock:
+                    self.processes.pop(slot, None)
+                    if job_id in self.cancelled:
+                        self.confirm_cancel(job)
+                        return
+                self.conn.send({'type': 'result', 'job_id': job_id,
+                                'test': name, 'exit_code': exit_code})
+
+            self.conn.send({'type': 'done', 'job_id': job_id})
+            print(f"🏁 Job {job_id}: {job['card']} done")
+
+        except OSError:
+            # Coordinator went away; it will requeue the card
+            pass
+
+    def confirm_cancel(self, job):
+        """Tell the coordinator the slot is free again (no test process left)"""
+        print(f"⏹️  Job {job['job_id']}: {job['card']} cancelled by coordinator")
+        self.conn.send({'type': 'cancelled', 'job_id': job['job_id'], 'slot': job['slot']})
+
+    def cancel_job(self, job_id, slot):
+        """Stop a job that ran past the coordinator's deadline"""
+        with self.lock:
+            self.cancelled.add(job_id)
+            process = self.processes.get(slot)
+            if process is not None:
+                process.kill()
+
+    def heartbeat(self, conn, stop, interval):
+        while not stop.wait(interval):
+            try:
+                conn.send({'type': 'ping'})
+            except OSError:
+                return
+
+    def kill_jobs(self):
+        with self.lock:
+            for process in self.processes.values():
+                process.kill()
+            self.processes.clear()
+
+    def serve(self, host, port, heartbeat_interval=5):
+        """
+        Handle one coordinator session
+
+        Returns:
+            True if the coordinator sent shutdown, False if the connection dropped
+        """
+        sock = socket.create_connection((host, port), timeout=10)
+        self.conn = LineSocket(sock)
+        stop = threading.Event()
+        jobs = []
+
+        try:
+            self.conn.send({'type': 'register', 'host': self.name, 'slots': self.slots})
+            print(f"🔌 Connected to {host}:{port} ({len(self.slots)} slots)")
+
+            threading.Thread(target=self.heartbeat,
+                             args=(self.conn, stop, heartbeat_interval),
+                             daemon=True).start()
+
+            while True:
+                message = self.conn.recv()
+                if message['type'] == 'shutdown':
+                    print("✅ Coordinator finished, shutting down")
+                    return True
+                elif message['type'] == 'cancel':
+                    self.cancel_job(message['job_id'], message['slot'])
+                elif message['type'] == 'job':
+                    job = threading.Thread(target=self.run_job, args=(message,), daemon=True)
+                    job.start()
+                    jobs.append(job)
+
+        except (ConnectionError, OSError, ValueError) as e:
+            print(f"⚠️  Lost coordinator: {str(e)}")
+            return False
+
+        finally:
+            stop.set()
+            self.kill_jobs()
+            for job in jobs:
+                job.join(timeout=5)
+            self.conn.close()
+
+def run_agent(host, port=DEFAULT_PORT, name=None, slots=None, retries=5,
+              fake_seconds=None, fake_fail=()):
+    """
+    Connect to the coordinator and run jobs until it shuts us down
+
+    Args:
+        host, port: Coordinator address
+        name: Agent name shown in reports (default: hostname)
+        slots: GPU indices to offer (default: all GPUs from nvidia-smi)
+        retries: Reconnect attempts after losing the coordinator
+        fake_seconds: Use fake slots whose tests take this many seconds
+        fake_fail: Test names that fail in fake mode
+
+    Returns:
+        0 = shut down by coordinator, 1 = gave up
+    """
+
+    print("=" * 60)
+    print("BENCH AGENT")
+    print("=" * 60)
+
+    name = name or socket.gethostname()
+    if slots is None:
+        slots = detect_slots()
+    if not slots:
+        print("❌ No GPU slots found!")
+        return 1
+
+    agent = Agent(name, slots, fake_seconds, fake_fail)
+    print(f"\n🔧 Agent: {name}")
+    print(f"📊 Slots: {', '.join(str(s) for s in slots)}"
+          f"{' (fake)' if fake_seconds is not None else ''}")
+    print("-" * 60)
+
+    attempt = 0
+    try:
+        while attempt <= retries:
+            try:
+                if agent.serve(host, port):
+                    return 0
+                attempt = 0  # Had a working session, start counting again
+            except OSError as e:
+                attempt += 1
+                print(f"⚠️  Cannot reach coordinator ({str(e)}), retry {attempt}/{retries}")
+            time.sleep(2)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Agent interrupted by user")
+        agent.kill_jobs()
+        return 1
+
+    print("❌ Giving up on coordinator")
+    return 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RTX 3090 Bench Agent")
+    parser.add_argument("coordinator",
+                        help="Coordinator address (host or host:port)")
+    parser.add_argument("--name", default=None,
+                        help="Agent name in reports (default: hostname)")
+    parser.add_argument("--slots", default=None,
+                        help="Comma-separated GPU indices (default: all)")
+    parser.add_argument("--retries", type=int, default=5,
+                        help="Reconnect attempts (default: 5)")
+    parser.add_argument("--fake", type=int, default=0,
+                        help="Offer N fake slots instead of real GPUs (for testing)")
+    parser.add_argument("--fake-seconds", type=float, default=1.0,
+                        help="Duration of each fake test (default: 1)")
+    parser.add_argument("--fake-fail", action="append", default=[],
+                        help="Name of a test that fails in fake mode (repeatable)")
+
+    args = parser.parse_args()
+
+    host, _, port = args.coordinator.partition(":")
+    port = int(port) if port else DEFAULT_PORT
+
+    if args.fake:
+        slots = list(range(args.fake))
+        fake_seconds = args.fake_seconds
+    else:
+        slots = [int(s) for s in args.slots.split(",")] if args.slots else None
+        fake_seconds = None
+
+    result = run_agent(host, port, args.name, slots, args.retries,
+                       fake_seconds, args.fake_fail)
+
+    sys.exit(result)
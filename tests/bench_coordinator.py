@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Bench Coordinator - Distribute card tests across several bench PCs and merge reports
+
+Each bench PC runs bench_agent.py, which connects here over TCP and
+registers its GPU slots. Queued cards are handed to free slots as they
+come up, test output is streamed back, and all results end up in one
+report. Cards on an agent that disconnects are put back in the queue.
+
+Cards whose tests run past the job deadline (a wedged card) are marked
+ERROR and their slot stays out of rotation until the agent confirms the
+test process exited. If no connected agent has a usable slot left, the
+remaining queue is marked ERROR instead of waiting forever.
+
+Protocol: one JSON object per line, in both directions.
+    agent -> coordinator: register, ping, output, result, done, cancelled
+    coordinator -> agent: job, cancel, shutdown
+"""
+
+import argparse
+import itertools
+import json
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+# Same tests as quick_test.sh: (name, [script, args...])
+DEFAULT_TESTS = [
+    ("GPU Info", ["gpu_info.py"]),
+    ("VRAM", ["vram_test.py", "--duration", "5", "--size", "20"]),
+    ("Thermal", ["thermal_test.py", "--duration", "3"]),
+    ("Performance", ["performance_test.py"]),
+]
+
+DEFAULT_PORT = 5090
+
+class LineSocket:
+    """Newline-delimited JSON messages over a TCP socket"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b""
+        self.send_lock = threading.Lock()
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode()
+        with self.send_lock:
+            self.sock.sendall(data)
+
+    def recv(self, timeout=None):
+        """Return the next message, or None if `timeout` expires first"""
+        while b"\n" not in self.buffer:
+            self.sock.settimeout(timeout)
+            try:
+                chunk = self.sock.recv(65536)
+            except socket.timeout:
+                return None
+            if not chunk:
+                raise ConnectionError("connection closed")
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+def card_verdict(exit_codes):
+    """Combine per-test exit codes the same way quick_test.sh does"""
+    if any(code not in (0, 2) for code in exit_codes):
+        return "FAIL"
+    if any(code == 2 for code in exit_codes):
+        return "WARNING"
+    return "PASS"
+
+class Coordinator:
+    """Job queue and merged results, shared by all agent connections"""
+
+    def __init__(self, cards, tests, max_attempts=2, job_timeout=1800, verbose=False):
+        self.tests = tests
+        self.max_attempts = max_attempts
+        self.job_timeout = job_timeout
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.queue = deque({'card': card, 'attempts': 0} for card in cards)
+        self.in_flight = {}
+        self.reports = {card: None for card in cards}
+        self.job_ids = itertools.count(1)
+        self.usable_slots = {}  # agent connection -> slots free or running a job
+
+    def next_job(self, host, slot):
+        """Pop the next queued card for a free slot, or None"""
+        with self.lock:
+            if not self.queue:
+                return None
+            job = self.queue.popleft()
+            job['attempts'] += 1
+            job['job_id'] = next(self.job_ids)
+            job['host'] = host
+            job['slot'] = slot
+            job['results'] = {}
+            job['log'] = []
+            job['started'] = time.time()
+            self.in_flight[job['job_id']] = job
+        print(f"▶️  {job['card']} → {host} slot {slot} (attempt {job['attempts']})")
+        return job
+
+    def record_output(self, job_id, line):
+        with self.lock:
+            job = self.in_flight.get(job_id)
+            if job is None:
+                return
+            job['log'].append(line)
+        if self.verbose:
+            print(f"   [{job['host']}:{job['slot']} {job['card']}] {line}")
+
+    def record_result(self, job_id, test, exit_code):
+        with self.lock:
+            job = self.in_flight.get(job_id)
+            if job is None:
+                return
+            job['results'][test] = exit_code
+        status = {0: "✅ PASS", 2: "⚠️  WARNING"}.get(exit_code, "❌ FAIL")
+        print(f"   {job['card']}: {test} {status}")
+
+    def finish(self, job_id):
+        with self.lock:
+            job = self.in_flight.pop(job_id, None)
+            if job is None:
+                return
+            verdict = card_verdict(job['results'].values())
+            self.reports[job['card']] = {
+                'card': job['card'],
+                'host': job['host'],
+                'slot': job['slot'],
+                'attempts': job['attempts'],
+                'duration_seconds': round(time.time() - job['started'], 1),
+                'verdict': verdict,
+                'results': job['results'],
+                'log': job['log'],
+            }
+        print(f"🏁 {job['card']}: {verdict} ({job['host']} slot {job['slot']})")
+
+    def requeue(self, job_id):
+        """Put a card from a lost agent back in the queue (front, so it isn't starved)"""
+        with self.lock:
+            job = self.in_flight.pop(job_id, None)
+            if job is None:
+                return
+            if job['attempts'] < self.max_attempts:
+                self.queue.appendleft({'card': job['card'], 'attempts': job['attempts']})
+                print(f"🔁 {job['card']}: agent {job['host']} lost, requeued")
+                return
+            self.error_report(job, "agent lost")
+        print(f"❌ {job['card']}: agent lost {job['attempts']} times, giving up")
+
+    def expired_jobs(self, job_ids):
+        """Which of `job_ids` have run longer than the job deadline"""
+        now = time.time()
+        with self.lock:
+            return [job_id for job_id in job_ids
+                    if job_id in self.in_flight
+                    and now - self.in_flight[job_id]['started'] > self.job_timeout]
+
+    def expire(self, job_id):
+        """Give up on a job that hung - the card is not retried elsewhere"""
+        with self.lock:
+            job = self.in_flight.pop(job_id, None)
+            if job is None:
+                return
+            self.error_report(job, f"timed out after {self.job_timeout}s")
+        print(f"❌ {job['card']}: no result after {self.job_timeout}s "
+              f"({job['host']} slot {job['slot']}), marked ERROR")
+
+    def update_slots(self, agent, usable):
+        """Record how many usable slots an agent connection has (None = gone)"""
+        with self.lock:
+            if usable is None:
+                self.usable_slots.pop(agent, None)
+            else:
+                self.usable_slots[agent] = usable
+
+    def drain_if_stuck(self):
+        """Mark the queue ERROR if agents are connected but none has a usable slot"""
+        with self.lock:
+            if not self.queue or not self.usable_slots or any(self.usable_slots.values()):
+                return
+            cards = []
+            while self.queue:
+                job = self.queue.popleft()
+                job.update(host=None, slot=None, started=time.time(), results={}, log=[])
+                self.error_report(job, "no healthy slots")
+                cards.append(job['card'])
+        print(f"❌ No healthy slots left, marked ERROR: {', '.join(cards)}")
+
+    def error_report(self, job, reason):
+        """Record an ERROR verdict (caller holds the lock)"""
+        self.reports[job['card']] = {
+            'card': job['card'],
+            'host': job['host'],
+            'slot': job['slot'],
+            'attempts': job['attempts'],
+            'duration_seconds': round(time.time() - job['started'], 1),
+            'verdict': "ERROR",
+            'reason': reason,
+            'results': job['results'],
+            'log': job['log'],
+        }
+
+    def all_done(self):
+        with self.lock:
+            return not self.queue and not self.in_flight
+
+def handle_agent(sock, address, coordinator, agent_timeout):
+    """Serve one agent connection until the queue drains or the agent goes away"""
+    conn = LineSocket(sock)
+    running = {}  # job_id -> slot
+    cancelling = {}  # job_id -> (slot, cancel time), waiting for the agent to confirm the kill
+    host = f"{address[0]}:{address[1]}"
+
+    try:
+        message = conn.recv(timeout=agent_timeout)
+        if message is None or message.get('type') != 'register':
+            print(f"⚠️  {host}: did not register, dropping")
+            return
+        host = message.get('host', host)
+        free_slots = list(message['slots'])
+        print(f"🔌 Agent {host} registered ({len(free_slots)} slots)")
+
+        last_seen = time.time()
+        while not coordinator.all_done():
+            # Fill free slots
+            while free_slots:
+                job = coordinator.next_job(host, free_slots[0])
+                if job is None:
+                    break
+                slot = free_slots.pop(0)
+                running[job['job_id']] = slot
+                conn.send({
+                    'type': 'job',
+                    'job_id': job['job_id'],
+                    'card': job['card'],
+                    'slot': slot,
+                    'tests': coordinator.tests,
+                })
+
+            # Hung tests keep the heartbeat alive, so enforce the job deadline here.
+            # The slot stays out of rotation until the agent reports the test
+            # process gone; a wedged card may never let it exit, so after
+            # agent_timeout the slot no longer counts as usable.
+            for job_id in coordinator.expired_jobs(running):
+                slot = running.pop(job_id)
+                cancelling[job_id] = (slot, time.time())
+                coordinator.expire(job_id)
+                conn.send({'type': 'cancel', 'job_id': job_id, 'slot': slot})
+
+            pending = [t for _, t in cancelling.values() if time.time() - t < agent_timeout]
+            coordinator.update_slots(conn, len(free_slots) + len(running) + len(pending))
+            coordinator.drain_if_stuck()
+
+            # Short timeout so idle agents pick up requeued cards quickly
+            message = conn.recv(timeout=1.0)
+            if message is None:
+                if time.time() - last_seen > agent_timeout:
+                    raise ConnectionError(f"no heartbeat for {agent_timeout}s")
+                continue
+            last_seen = time.time()
+
+            kind = message.get('type')
+            if kind == 'output':
+                coordinator.record_output(message['job_id'], message['line'])
+            elif kind == 'result':
+                coordinator.record_result(message['job_id'], message['test'], message['exit_code'])
+            elif kind == 'done' and message['job_id'] in running:
+                coordinator.finish(message['job_id'])
+                free_slots.append(running.pop(message['job_id']))
+            elif kind == 'cancelled' and message['job_id'] in cancelling:
+                slot, _ = cancelling.pop(message['job_id'])
+                free_slots.append(slot)
+                print(f"🔁 {host} slot {slot} released after cancel")
+
+        conn.send({'type': 'shutdown'})
+
+    except (ConnectionError, OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Agent {host} disconnected: {str(e)}")
+
+    finally:
+        coordinator.update_slots(conn, None)
+        for job_id in running:
+            coordinator.requeue(job_id)
+        conn.close()
+
+def print_summary(coordinator):
+    """Print the merged report and return the overall exit code"""
+    print("\n" + "=" * 60)
+    print("BENCH SUMMARY")
+    print("=" * 60)
+
+    verdicts = []
+    for card, report in coordinator.reports.items():
+        if report is None:
+            verdicts.append("ERROR")
+            print(f"{card:<20} {'NOT TESTED':<10}")
+            continue
+        verdicts.append(report['verdict'])
+        reason = f" ({report['reason']})" if 'reason' in report else ""
+        where = f"{report['host']} slot {report['slot']}" if report['host'] else "-"
+        print(f"{card:<20} {report['verdict']:<10} {where}{reason}")
+
+    print("\n" + "=" * 60)
+    print(f"Cards: {len(verdicts)} | "
+          f"Pass: {verdicts.count('PASS')} | "
+          f"Warning: {verdicts.count('WARNING')} | "
+          f"Fail: {verdicts.count('FAIL')} | "
+          f"Error: {verdicts.count('ERROR')}")
+    print("=" * 60)
+
+    if verdicts.count('FAIL') or verdicts.count('ERROR'):
+        return 1
+    if verdicts.count('WARNING'):
+        return 2
+    return 0
+
+def run_coordinator(cards, host="0.0.0.0", port=DEFAULT_PORT, tests=DEFAULT_TESTS,
+                    report_path=None, max_attempts=2, agent_timeout=30, job_timeout=1800,
+                    verbose=False):
+    """
+    Accept agents and run until every queued card has a verdict
+
+    Args:
+        cards: Card labels to test (serial numbers, shelf tags, ...)
+        host, port: Address to listen on
+        tests: List of (name, [script, args...]) to run for each card
+        report_path: Write the merged JSON report here if given
+        max_attempts: How many times a card is retried after agent loss
+        agent_timeout: Seconds without a message before an agent is dropped
+        job_timeout: Seconds a card may take before it is marked ERROR
+        verbose: Echo every line of test output
+
+    Returns:
+        0 = all pass, 1 = any fail/error, 2 = warnings only
+    """
+
+    print("=" * 60)
+    print("BENCH COORDINATOR")
+    print("=" * 60)
+
+    coordinator = Coordinator(cards, tests, max_attempts, job_timeout, verbose)
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((host, port))
+    server.listen()
+    server.settimeout(1.0)
+
+    print(f"\n📡 Listening on {host}:{port}")
+    print(f"📋 Cards queued: {len(cards)}")
+    print(f"🧪 Tests per card: {', '.join(name for name, _ in tests)}")
+    print("-" * 60)
+
+    handlers = []
+    try:
+        while not coordinator.all_done():
+            try:
+                sock, address = server.accept()
+            except socket.timeout:
+                continue
+            handler = threading.Thread(target=handle_agent,
+                                       args=(sock, address, coordinator, agent_timeout),
+                                       daemon=True)
+            handler.start()
+            handlers.append(handler)
+
+        # Let handlers send shutdown to their agents
+        for handler in handlers:
+            handler.join(timeout=5)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Coordinator interrupted by user")
+
+    finally:
+        server.close()
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(list(coordinator.reports.values()), f, indent=2)
+        print(f"\n📝 Report written to {report_path}")
+
+    return print_summary(coordinator)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RTX 3090 Bench Coordinator")
+    parser.add_argument("cards", nargs="+",
+                        help="Card labels to test (e.g. serial numbers)")
+    parser.add_argument("--host", default="0.0.0.0",
+                        help="Address to listen on (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--report", default="bench_report.json",
+                        help="Merged JSON report path (default: bench_report.json)")
+    parser.add_argument("--attempts", type=int, default=2,
+                        help="Max attempts per card if an agent disconnects (default: 2)")
+    parser.add_argument("--agent-timeout", type=int, default=30,
+                        help="Seconds without heartbeat before dropping an agent (default: 30)")
+    parser.add_argument("--job-timeout", type=int, default=1800,
+                        help="Seconds per card before it is marked ERROR (default: 1800)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Echo all test output from agents")
+
+    args = parser.parse_args()
+
+    if len(set(args.cards)) != len(args.cards):
+        print("❌ Card labels must be unique")
+        sys.exit(1)
+
+    result = run_coordinator(args.cards, args.host, args.port,
+                             report_path=args.report,
+                             max_attempts=args.attempts,
+                             agent_timeout=args.agent_timeout,
+                             job_timeout=args.job_timeout,
+                             verbose=args.verbose)
+
+    sys.exit(result)
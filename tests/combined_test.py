@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Combined Stress Test - Overlap compute, memory and PCIe traffic on separate streams"""
+
+import torch
+import contextlib
+import argparse
+import threading
+import sys
+import time
+
+from gpu_backend import query_nvidia_smi
+from thermal_test import get_temperature
+
+# Workload sizes: (GEMM matrix size, bandwidth buffer MB, PCIe transfer MB)
+CUDA_SIZES = (8192, 2000, 256)
+CPU_SIZES = (512, 64, 16)
+
+# Extra time the combined run may take before a still-running stream counts as hung
+HANG_GRACE_SECONDS = 30
+
+def get_power_draw():
+    """Get current GPU power draw (W)"""
+    try:
+        return float(query_nvidia_smi("power.draw")[0])
+    except:
+        return None
+
+def make_gemm_workload(device, size):
+    """FP32 matmul - drives the SMs"""
+    a = torch.randn(size, size, device=device, dtype=torch.float32)
+    b = torch.randn(size, size, device=device, dtype=torch.float32)
+    c = torch.empty_like(a)
+
+    def step():
+        torch.matmul(a, b, out=c)
+
+    return {
+        'name': 'GEMM',
+        'step': step,
+        'work_per_step': 2 * size ** 3,
+        'unit': 'TFLOPS',
+        'scale': 1e12,
+        'batch': 5,
+        'output': c,
+    }
+
+def make_bandwidth_workload(device, size_mb):
+    """Device-to-device copy - drives the memory controllers"""
+    elements = int(size_mb * 1024 * 1024 / 4)  # float32 = 4 bytes
+    a_mem = torch.randn(elements, dtype=torch.float32, device=device)
+    b_mem = torch.zeros_like(a_mem)
+
+    def step():
+        b_mem.copy_(a_mem)
+
+    return {
+        'name': 'Bandwidth',
+        'step': step,
+        'work_per_step': elements * 4,
+        'unit': 'GB/s',
+        'scale': 1e9,
+        'batch': 20,
+    }
+
+def make_pcie_workload(device, size_mb):
+    """Host-to-device then device-to-host copy - drives the PCIe link"""
+    elements = int(size_mb * 1024 * 1024 / 4)
+    host = torch.randn(elements, dtype=torch.float32)
+    if device.type == "cuda":
+        host = host.pin_memory()  # Pinned memory for async DMA transfers
+    dev = torch.empty(elements, dtype=torch.float32, device=device)
+
+    def step():
+        dev.copy_(host, non_blocking=True)  # H2D
+        host.copy_(dev, non_blocking=True)  # D2H
+
+    return {
+        'name': 'PCIe H2D/D2H',
+        'step': step,
+        'work_per_step': 2 * elements * 4,
+        'unit': 'GB/s',
+        'scale': 1e9,
+        'batch': 5,
+    }
+
+def stream_context(stream):
+    """Make `stream` current for this thread (no-op on CPU)"""
+    if stream is None:
+        return contextlib.nullcontext()
+    return torch.cuda.stream(stream)
+
+def synchronize(stream):
+    """Wait for all work queued on `stream` (no-op on CPU)"""
+    if stream is not None:
+        stream.synchronize()
+
+def run_workload(workload, duration, stream=None, barrier=None):
+    """
+    Run one workload in a loop for `duration` seconds
+
+    Work is issued in batches and the stream is synchronized after each
+    batch, so only completed work is counted and the CPU never queues
+    far ahead of the GPU.
+
+    Returns:
+        dict with steps, elapsed seconds and throughput (in workload units)
+    """
+    step = workload['step']
+    batch = workload['batch']
+    steps = 0
+
+    with stream_context(stream):
+        if barrier is not None:
+            barrier.wait()
+
+        start = time.perf_counter()
+        while (time.perf_counter() - start) < duration:
+            for _ in range(batch):
+                step()
+            synchronize(stream)
+            steps += batch
+        elapsed = time.perf_counter() - start
+
+    throughput = (steps * workload['work_per_step'] / elapsed) / workload['scale']
+    return {'steps': steps, 'elapsed': elapsed, 'throughput': throughput}
+
+def run_concurrent(workloads, duration, use_streams, grace=HANG_GRACE_SECONDS):
+    """
+    Run all workloads at the same time, one thread and one stream each
+
+    On CUDA every thread issues into its own stream so the kernels and
+    copies overlap on the device. On CPU the threads alone provide the
+    concurrency. Workers still running `grace` seconds after `duration`
+    are reported as hung and left behind (they are daemon threads).
+
+    Returns:
+        (results by workload name, errors by workload name, temps, power samples)
+    """
+    results = {}
+    errors = {}
+    barrier = threading.Barrier(len(workloads))
+
+    def worker(workload):
+        try:
+            stream = torch.cuda.Stream() if use_streams else None
+            results[workload['name']] = run_workload(workload, duration, stream, barrier)
+        except Exception as e:
+            errors[workload['name']] = f"{type(e).__name__}: {str(e)}"
+            barrier.abort()  # Release the other threads if we failed before starting
+
+    threads = {w['name']: threading.Thread(target=worker, args=(w,), daemon=True) for w in workloads}
+    for t in threads.values():
+        t.start()
+
+    # Sample telemetry from the main thread while the workers run
+    temps = []
+    powers = []
+    start_time = time.time()
+    deadline = start_time + duration + grace
+    while any(t.is_alive() for t in threads.values()):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        running = [t for t in threads.values() if t.is_alive()]
+        running[0].join(timeout=min(10, remaining))
+
+        if not use_streams or not any(t.is_alive() for t in threads.values()):
+            continue
+
+        current_temp = get_temperature()
+        current_power = get_power_draw()
+        if current_temp:
+            temps.append(current_temp)
+        if current_power:
+            powers.append(current_power)
+
+        elapsed = time.time() - start_time
+        progress = min(elapsed / duration, 1.0) * 100
+        temp_str = f"{current_temp:3d}°C" if current_temp else "  n/a"
+        power_str = f"{current_power:5.1f} W" if current_power else "  n/a"
+        print(f"   [{progress:5.1f}%] Temp: {temp_str} | Power: {power_str}")
+
+    for name, t in threads.items():
+        if t.is_alive():
+            errors[name] = f"stream hung (still running {grace}s after the {duration}s run)"
+
+    return results, errors, temps, powers
+
+def combined_stress_test(duration_seconds=60, force_cpu=False,
+                         efficiency_warn=0.8, efficiency_fail=0.5, min_ratio=0.4):
+    """
+    Combined stress test with per-stream throughput accounting
+
+    Runs GEMM, a bandwidth kernel and H2D/D2H transfers first on their own,
+    then all together, and compares the two. A card that is healthy under
+    each load alone may still crash, produce wrong results or collapse in
+    throughput once it hits the combined power limit.
+
+    Args:
+        duration_seconds: Duration of each standalone run and of the combined run
+        force_cpu: Run on CPU threads even if CUDA is available
+        efficiency_warn: Sum of combined/standalone ratios below this = WARNING
+        efficiency_fail: Sum of ratios below this = FAIL (throughput collapse)
+        min_ratio: Any single workload below this ratio = FAIL (one stream starved)
+
+    Returns:
+        0 = pass, 1 = fail, 2 = warning
+    """
+
+    print("=" * 60)
+    print("COMBINED STRESS TEST")
+    print("=" * 60)
+
+    if not torch.cuda.is_available() and not force_cpu:
+        print("❌ CUDA not available! GPU was not tested")
+        print("   Use --cpu for a scheduling-only run")
+        return 1
+
+    use_cuda = not force_cpu
+
+    if use_cuda:
+        device = torch.device("cuda:0")
+        print(f"\n🔧 GPU: {torch.cuda.get_device_name(0)}")
+        gemm_size, bw_mb, pcie_mb = CUDA_SIZES
+    else:
+        device = torch.device("cpu")
+        print("\n⚠️  CPU mode only validates the scheduling logic, not the GPU")
+        print("⚠️  Threads share CPU cores, so throughput ratios are not judged")
+        gemm_size, bw_mb, pcie_mb = CPU_SIZES
+
+    print(f"⏱️  Duration: {duration_seconds}s per standalone run + {duration_seconds}s combined")
+    print("-" * 60)
+
+    workloads = []
+
+    try:
+        print("\n1️⃣  Creating workloads...")
+        workloads = [
+            make_gemm_workload(device, gemm_size),
+            make_bandwidth_workload(device, bw_mb),
+            make_pcie_workload(device, pcie_mb),
+        ]
+        print(f"   ✓ GEMM: {gemm_size}x{gemm_size} FP32")
+        print(f"   ✓ Bandwidth: {bw_mb} MB copy")
+        print(f"   ✓ PCIe: {pcie_mb} MB each way")
+
+        # Standalone baselines
+        print("\n2️⃣  Standalone baselines...")
+        standalone = {}
+        for workload in workloads:
+            stream = torch.cuda.Stream() if use_cuda else None
+            with stream_context(stream):
+                workload['step']()  # Warmup on the same stream as the timed run
+            synchronize(stream)
+            standalone[workload['name']] = run_workload(workload, duration_seconds, stream)
+            print(f"   {workload['name']:<14} {standalone[workload['name']]['throughput']:8.2f} {workload['unit']}")
+
+        # Reference GEMM output to check for silent errors under combined load
+        gemm = workloads[0]
+        reference = gemm['output'].clone()
+
+        # Combined run
+        print(f"\n3️⃣  Running all workloads concurrently ({len(workloads)} streams)...")
+        if use_cuda:
+            print("   Monitoring temperature and power every 10 seconds\n")
+        concurrent, errors, temps, powers = run_concurrent(workloads, duration_seconds, use_cuda)
+
+        gemm_ok = torch.allclose(gemm['output'], reference, rtol=1e-3, atol=1e-3)
+        del reference
+
+        # Per-stream accounting
+        print("\n" + "=" * 60)
+        print("COMBINED STRESS SUMMARY")
+        print("=" * 60)
+        print(f"{'Workload':<14} {'Alone':>10} {'Combined':>10} {'Ratio':>7}")
+
+        efficiency = 0.0
+        starved = []
+        for workload in workloads:
+            name = workload['name']
+            alone = standalone[name]['throughput']
+            if name in errors:
+                print(f"{name:<14} {alone:10.2f} {'ERROR':>10} {'-':>7}")
+                continue
+            together = concurrent[name]['throughput']
+            ratio = together / alone if alone > 0 else 0.0
+            efficiency += ratio
+            if ratio < min_ratio:
+                starved.append(f"{name}: {ratio:.0%} of standalone (minimum {min_ratio:.0%})")
+            print(f"{name:<14} {alone:10.2f} {together:10.2f} {ratio:6.0%}  ({workload['unit']})")
+
+        # A perfectly shared device sums to ~100%, real overlap goes above it
+        print(f"\nCombined efficiency: {efficiency:.0%} of standalone (sum of ratios)")
+
+        if temps:
+            print(f"Max temperature: {max(temps)}°C")
+        if powers:
+            print(f"Max power draw: {max(powers):.1f} W")
+
+        # Decision
+        print("\n" + "=" * 60)
+
+        if errors or not gemm_ok:
+            print("❌ COMBINED STRESS TEST: FAIL")
+            for name, error in errors.items():
+                print(f"   - {name} failed under combined load: {error}")
+            if not gemm_ok:
+                print("   - GEMM results differ from standalone run (silent compute errors)")
+            print("❌ Card is unstable under combined power draw")
+            result_code = 1
+        elif not use_cuda:
+            print("✅ COMBINED STRESS TEST: PASS (CPU scheduling only)")
+            result_code = 0
+        elif efficiency < efficiency_fail or starved:
+            print("❌ COMBINED STRESS TEST: FAIL")
+            print("❌ Throughput collapsed under combined load")
+            for item in starved:
+                print(f"   - {item}")
+            print("❌ Likely power-limit or VRM problem")
+            result_code = 1
+        elif efficiency < efficiency_warn:
+            print("⚠️  COMBINED STRESS TEST: WARNING")
+            print("⚠️  Heavy contention under combined load")
+            print("⚠️  Check power supply and power limit (nvidia-smi -q -d POWER)")
+            result_code = 2
+        else:
+            print("✅ COMBINED STRESS TEST: PASS")
+            print("✅ Throughput holds up under combined load")
+            result_code = 0
+
+        print("=" * 60)
+
+        return result_code
+
+    except Exception as e:
+        print(f"\n❌ ERROR: {str(e)}")
+        return 1
+
+    finally:
+        workloads.clear()
+        if use_cuda:
+            torch.cuda.empty_cache()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RTX 3090 Combined Stress Test")
+    parser.add_argument("--duration", type=int, default=60,
+                        help="Seconds per standalone run and for the combined run (default: 60)")
+    parser.add_argument("--cpu", action="store_true",
+                        help="Run on CPU threads (tests the scheduling logic without a GPU)")
+    parser.add_argument("--efficiency-warn", type=float, default=0.8,
+                        help="WARNING if the sum of combined/standalone ratios is below this (default: 0.8)")
+    parser.add_argument("--efficiency-fail", type=float, default=0.5,
+                        help="FAIL if the sum of ratios is below this (default: 0.5)")
+    parser.add_argument("--min-ratio", type=float, default=0.4,
+                        help="FAIL if any single workload keeps less than this ratio (default: 0.4)")
+
+    args = parser.parse_args()
+
+    if args.duration < 1:
+        print("❌ Duration must be at least 1 second")
+        sys.exit(1)
+
+    result = combined_stress_test(args.duration, args.cpu, args.efficiency_warn,
+                                  args.efficiency_fail, args.min_ratio)
+
+    sys.exit(result)
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""GPU Backend - Real CUDA device or a simulated one for testing without hardware
+
+The test scripts talk to the card through get_backend() instead of calling
+torch.cuda and nvidia-smi directly. By default that is the real CUDA card.
+With GPU_BACKEND=sim they get a simulated RTX 3090 instead:
+
+- tensors live on the CPU, scaled down so a "20 GB" test fits in RAM
+- matmuls and copies advance a virtual clock by the time a real card would
+  take (performance model), everything else runs time-compressed
+- temperature follows a thermal RC model driven by how busy the card is,
+  or a scripted telemetry timeline
+- faults can be injected: bit flips, throttling, overheating, OOM, ...
+
+Environment:
+    GPU_BACKEND          cuda (default) or sim
+    GPU_INDEX            nvidia-smi index of the card under test (default: 0)
+    GPU_SIM_FAULTS       Comma-separated faults, see SIM_FAULTS
+    GPU_SIM_TIME_SCALE   Virtual seconds per real second (default: 60)
+    GPU_SIM_SEED         Random seed for fault injection (default: 0)
+    GPU_SIM_CONFIG       JSON file overriding SIM_DEFAULTS
+
+Example:
+    GPU_BACKEND=sim GPU_SIM_FAULTS=bitflip bash quick_test.sh
+"""
+
+import torch
+import json
+import math
+import os
+import random
+import subprocess
+import time
+
+# Simulated RTX 3090 (Founders Edition, healthy)
+SIM_DEFAULTS = {
+    'name': "NVIDIA GeForce RTX 3090 (Simulated)",
+    'total_memory': 25_447_170_048,  # Bytes, as reported by a real 3090
+    'compute_capability': [8, 6],
+    'driver_version': "550.54.14 (simulated)",
+    'pcie_link': [4, 16],            # Gen, width
+    # Performance model (what the benchmarks measure on a good card)
+    'fp32_tflops': 29.5,
+    'fp16_tflops': 92.0,
+    'bandwidth_gbs': 850.0,
+    'clock_factor': 1.0,             # < 1.0 = clocks held down
+    # Thermal RC model: T_steady = ambient + R * P, time constant tau
+    'ambient_temp': 30.0,            # °C
+    'thermal_resistance': 0.13,      # °C/W
+    'thermal_tau': 45.0,             # Seconds
+    'idle_power': 25.0,              # W
+    'max_power': 350.0,              # W
+    'throttle_temp': 83.0,           # °C, clocks drop above this
+    'throttle_factor': 0.8,          # Clock factor while thermal throttling
+    # Fault injection
+    'bitflip_rate': 0.0,             # Chance of a bit flip per inject_faults() call
+    'oom_above_gb': None,            # Allocations past this many GB fail
+    # Scaling of the CPU stand-in tensors
+    'dim_scale': 32,                 # Matrix dimensions divided by this
+    'element_scale': 1024,           # Flat tensor sizes divided by this
+    # Scripted telemetry: [{"at": seconds, "temperature": °C}, ...]
+    'telemetry': None,
+}
+
+# Named faults for GPU_SIM_FAULTS and the settings they change
+SIM_FAULTS = {
+    'bitflip': {'bitflip_rate': 0.5},                    # Bad VRAM
+    'throttle': {'clock_factor': 0.6},                   # Stuck in low clocks / power limit
+    'hot': {'thermal_resistance': 0.22},                 # Dried paste, dead fan
+    'oom': {'oom_above_gb': 8},                          # Allocation failures
+    'lowvram': {'total_memory': 21_474_836_480},         # Wrong or modded memory config
+    'pcie_x4': {'pcie_link': [3, 4]},                    # Damaged slot/fingers or riser
+}
+
+_backend = None
+
+def get_backend():
+    """Return the backend selected by GPU_BACKEND (created once per process)"""
+    global _backend
+    if _backend is None:
+        kind = os.environ.get("GPU_BACKEND", "cuda").lower()
+        if kind == "sim":
+            _backend = SimBackend.from_environment()
+        elif kind == "cuda":
+            _backend = CudaBackend()
+        else:
+            raise ValueError(f"Unknown GPU_BACKEND '{kind}' (expected 'cuda' or 'sim')")
+    return _backend
+
+def query_nvidia_smi(fields):
+    """
+    Query nvidia-smi for comma-separated `fields` of the card under test
+
+    nvidia-smi ignores CUDA_VISIBLE_DEVICES, so the physical index comes
+    from GPU_INDEX (set by bench_agent.py alongside CUDA_VISIBLE_DEVICES).
+    """
+    index = os.environ.get("GPU_INDEX", "0")
+    result = subprocess.run(
+        ["nvidia-smi", f"--query-gpu={fields}", "--format=csv,noheader,nounits", "-i", index],
+        capture_output=True, text=True, check=True
+    )
+    return [value.strip() for value in result.stdout.split(",")]
+
+class CudaBackend:
+    """The real card via torch.cuda and nvidia-smi"""
+
+    simulated = False
+
+    def is_available(self):
+        return torch.cuda.is_available()
+
+    def device(self):
+        return torch.device("cuda:0")
+
+    def get_device_name(self):
+        return torch.cuda.get_device_name(0)
+
+    def total_memory(self):
+        return torch.cuda.get_device_properties(0).total_memory
+
+    def compute_capability(self):
+        props = torch.cuda.get_device_properties(0)
+        return props.major, props.minor
+
+    def cuda_version(self):
+        return torch.version.cuda
+
+    def memory_allocated(self):
+        return torch.cuda.memory_allocated(0)
+
+    def memory_reserved(self):
+        return torch.cuda.memory_reserved(0)
+
+    def empty_cache(self):
+        torch.cuda.empty_cache()
+
+    def synchronize(self):
+        torch.cuda.synchronize()
+
+    def reserve(self, nbytes):
+        """Called before large allocations (only the simulator acts on it)"""
+
+    def release(self, nbytes):
+        """Called once reserved memory is freed (only the simulator acts on it)"""
+
+    def scale_dim(self, n):
+        return n
+
+    def scale_elements(self, n):
+        return n
+
+    def matmul(self, a, b):
+        return torch.matmul(a, b)
+
+    def copy_(self, dst, src):
+        return dst.copy_(src)
+
+    def inject_faults(self, tensor):
+        """Called after writes to VRAM (only the simulator acts on it)"""
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def temperature(self):
+        try:
+            return int(query_nvidia_smi("temperature.gpu")[0])
+        except:
+            return None
+
+    def driver_version(self):
+        try:
+            return query_nvidia_smi("driver_version")[0]
+        except:
+            return None
+
+    def pcie_link(self):
+        """Current PCIe (gen, width), or None"""
+        try:
+            gen, width = query_nvidia_smi("pcie.link.gen.current,pcie.link.width.current")
+            return int(gen), int(width)
+        except:
+            return None
+
+class SimBackend:
+    """
+    Simulated RTX 3090 on the CPU
+
+    Virtual clock: real time spent outside modeled ops runs `time_scale`
+    times faster; time inside matmul/copy is replaced by the modeled time
+    a real card would take; sleep() only advances the clock.
+    """
+
+    simulated = True
+
+    def __init__(self, config=None, time_scale=60.0, seed=0):
+        self.config = dict(SIM_DEFAULTS)
+        self.config.update(config or {})
+        self.time_scale = time_scale
+        self.random = random.Random(seed)
+
+        self.epoch = time.time()
+        self.wall_start = time.perf_counter()
+        self.excluded = 0.0   # Real seconds spent inside modeled ops
+        self.charged = 0.0    # Virtual seconds added by modeled ops and sleeps
+        self.busy = 0.0       # Virtual seconds the card was computing
+        self.allocated = 0    # Bytes handed out via reserve()
+
+        # Thermal state starts at idle equilibrium
+        c = self.config
+        self.temp = c['ambient_temp'] + c['thermal_resistance'] * c['idle_power']
+        self.throttling = False
+        self.last_update = self.time()
+        self.last_busy = 0.0
+
+    @classmethod
+    def from_environment(cls):
+        config = {}
+        path = os.environ.get("GPU_SIM_CONFIG")
+        if path:
+            with open(path) as f:
+                config.update(json.load(f))
+
+        faults = os.environ.get("GPU_SIM_FAULTS", "")
+        for fault in filter(None, (f.strip() for f in faults.split(","))):
+            if fault not in SIM_FAULTS:
+                raise ValueError(f"Unknown simulated fault '{fault}' "
+                                 f"(expected one of: {', '.join(SIM_FAULTS)})")
+            config.update(SIM_FAULTS[fault])
+
+        time_scale = float(os.environ.get("GPU_SIM_TIME_SCALE", 60))
+        seed = int(os.environ.get("GPU_SIM_SEED", 0))
+        return cls(config, time_scale, seed)
+
+    # Identity
+
+    def is_available(self):
+        return True
+
+    def device(self):
+        return torch.device("cpu")
+
+    def get_device_name(self):
+        return self.config['name']
+
+    def total_memory(self):
+        return self.config['total_memory']
+
+    def compute_capability(self):
+        return tuple(self.config['compute_capability'])
+
+    def cuda_version(self):
+        return "simulated"
+
+    def driver_version(self):
+        return self.config['driver_version']
+
+    def pcie_link(self):
+        return tuple(self.config['pcie_link'])
+
+    # Memory
+
+    def memory_allocated(self):
+        return self.allocated
+
+    def memory_reserved(self):
+        return self.allocated
+
+    def empty_cache(self):
+        pass  # Only live reservations are tracked, there is no cache to drop
+
+    def synchronize(self):
+        pass
+
+    def reserve(self, nbytes):
+        limit = self.config['oom_above_gb']
+        if limit is not None and (self.allocated + nbytes) / 1e9 > limit:
+            raise RuntimeError(f"CUDA out of memory. Tried to allocate {nbytes / 1e9:.2f} GB "
+                               f"(simulated, limit {limit} GB)")
+        if self.allocated + nbytes > self.total_memory():
+            raise RuntimeError(f"CUDA out of memory. Tried to allocate {nbytes / 1e9:.2f} GB "
+                               f"(simulated)")
+        self.allocated += nbytes
+
+    def release(self, nbytes):
+        self.allocated = max(0, self.allocated - nbytes)
+
+    def scale_dim(self, n):
+        return max(1, n // self.config['dim_scale'])
+
+    def scale_elements(self, n):
+        return max(1, n // self.config['element_scale'])
+
+    # Modeled ops
+
+    def clock_factor(self):
+        factor = self.config['clock_factor']
+        if self.throttling:
+            factor *= self.config['throttle_factor']
+        return factor
+
+    def run_modeled(self, op, model_seconds):
+        """Run `op` on the CPU but charge `model_seconds` to the virtual clock"""
+        start = time.perf_counter()
+        result = op()
+        self.excluded += time.perf_counter() - start
+        self.charged += model_seconds
+        self.busy += model_seconds
+        self.update_thermal()
+        return result
+
+    def matmul(self, a, b):
+        scale = self.config['dim_scale']
+        flops = 2 * a.shape[-2] * a.shape[-1] * b.shape[-1] * scale ** 3
+        tflops = self.config['fp16_tflops'] if a.dtype == torch.float16 else self.config['fp32_tflops']
+        seconds = flops / (tflops * 1e12 * self.clock_factor())
+
+        if a.dtype == torch.float16:
+            # Half matmul is slow or missing on some CPU builds
+            return self.run_modeled(lambda: torch.matmul(a.float(), b.float()).half(), seconds)
+        return self.run_modeled(lambda: torch.matmul(a, b), seconds)
+
+    def copy_(self, dst, src):
+        nbytes = src.numel() * src.element_size() * self.config['element_scale']
+        seconds = nbytes / (self.config['bandwidth_gbs'] * 1e9 * self.clock_factor())
+        return self.run_modeled(lambda: dst.copy_(src), seconds)
+
+    def inject_faults(self, tensor):
+        if self.config['bitflip_rate'] and self.random.random() < self.config['bitflip_rate']:
+            words = tensor.view(-1).view(torch.int32)
+            index = self.random.randrange(words.numel())
+            words[index] ^= 1 << self.random.randrange(31)
+
+    # Clock and telemetry
+
+    def time(self):
+        wall = time.perf_counter() - self.wall_start - self.excluded
+        return self.epoch + wall * self.time_scale + self.charged
+
+    def sleep(self, seconds):
+        self.charged += seconds
+        self.update_thermal()
+
+    def update_thermal(self):
+        """Advance the RC model to the current virtual time"""
+        c = self.config
+        now = self.time()
+        dt = now - self.last_update
+        if dt <= 0:
+            return
+
+        utilization = min(1.0, (self.busy - self.last_busy) / dt)
+        power = c['idle_power'] + utilization * (c['max_power'] - c['idle_power']) * self.clock_factor()
+        steady = c['ambient_temp'] + c['thermal_resistance'] * power
+        self.temp += (steady - self.temp) * (1 - math.exp(-dt / c['thermal_tau']))
+        self.throttling = self.temp >= c['throttle_temp']
+
+        self.last_update = now
+        self.last_busy = self.busy
+
+    def temperature(self):
+        telemetry = self.config['telemetry']
+        if telemetry:
+            elapsed = self.time() - self.epoch
+            current = telemetry[0]['temperature']
+            for point in telemetry:
+                if point['at'] <= elapsed:
+                    current = point['temperature']
+            return int(current)
+
+        self.update_thermal()
+        return int(round(self.temp))
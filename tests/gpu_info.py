@@ -2,9 +2,18 @@
 """GPU Information Check - Verify specs and basic health"""
 
 import torch
-import subprocess
 import sys
 
+from gpu_backend import get_backend
+
+# Limits shared with triage.py
+EXPECTED_MODEL = "3090"
+MIN_VRAM_GB = 23.5        # 24GB card reports ~25.4e9 bytes
+IDLE_TEMP_HIGH = 50       # °C - possible cooling issue
+IDLE_TEMP_WARM = 45       # °C - slightly warm
+FULL_LINK_WIDTH = 16
+MIN_LINK_WIDTH = 8        # x4 or narrower = damaged slot/fingers or riser
+
 def check_gpu_info():
     """Check GPU information and specs"""
     
@@ -12,93 +21,81 @@ def check_gpu_info():
     print("GPU INFORMATION CHECK")
     print("=" * 60)
     
-    if not torch.cuda.is_available():
+    backend = get_backend()
+    
+    if not backend.is_available():
         print("❌ CUDA not available!")
         return False
     
-    gpu_name = torch.cuda.get_device_name(0)
-    props = torch.cuda.get_device_properties(0)
+    gpu_name = backend.get_device_name()
     
     # Check if it's RTX 3090
     print(f"\n📊 GPU Details:")
     print(f"   Name: {gpu_name}")
     
-    if "3090" not in gpu_name:
+    if EXPECTED_MODEL not in gpu_name:
         print(f"   ⚠️  WARNING: Expected RTX 3090, got {gpu_name}")
     else:
         print(f"   ✓ Correct model detected")
     
     # Memory
-    vram_gb = props.total_memory / 1e9
+    vram_gb = backend.total_memory() / 1e9
     print(f"\n💾 VRAM:")
     print(f"   Total: {vram_gb:.2f} GB")
     
-    if vram_gb < 23.5:
+    if vram_gb < MIN_VRAM_GB:
         print(f"   ❌ VRAM too low! Expected 24GB, got {vram_gb:.2f}GB")
         return False
     else:
         print(f"   ✓ VRAM capacity correct")
     
     # Compute capability
+    major, minor = backend.compute_capability()
     print(f"\n⚙️  Compute Capability:")
-    print(f"   Version: {props.major}.{props.minor}")
+    print(f"   Version: {major}.{minor}")
     
-    if props.major < 8:
+    if major < 8:
         print(f"   ⚠️  Old architecture detected")
     else:
         print(f"   ✓ Ampere architecture (GA102)")
     
     # Temperature
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=temperature.gpu", "--format=csv,noheader"],
-            capture_output=True, text=True, check=True
-        )
-        temp = int(result.stdout.strip())
-        
+    temp = backend.temperature()
+    if temp is not None:
         print(f"\n🌡️  Temperature (Idle):")
         print(f"   Current: {temp}°C")
         
-        if temp > 50:
+        if temp > IDLE_TEMP_HIGH:
             print(f"   ⚠️  High idle temperature! Should be 30-45°C")
             print(f"   → Possible cooling issue or recent use")
-        elif temp > 45:
+        elif temp > IDLE_TEMP_WARM:
             print(f"   ⚠️  Slightly warm at idle")
         else:
             print(f"   ✓ Normal idle temperature")
-    except:
+    else:
         print(f"\n⚠️  Could not read temperature")
     
     # CUDA/Driver version
     print(f"\n🔧 Software:")
     print(f"   PyTorch: {torch.__version__}")
-    print(f"   CUDA: {torch.version.cuda}")
-    
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
-            capture_output=True, text=True, check=True
-        )
-        driver = result.stdout.strip()
-        print(f"   Driver: {driver}")
-    except:
-        print(f"   Driver: Unknown")
+    print(f"   CUDA: {backend.cuda_version()}")
+    print(f"   Driver: {backend.driver_version() or 'Unknown'}")
     
     # PCIe link
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=pcie.link.gen.current,pcie.link.width.current", "--format=csv,noheader"],
-            capture_output=True, text=True, check=True
-        )
-        pcie_info = result.stdout.strip()
+    link = backend.pcie_link()
+    if link is not None:
+        gen, width = link
         print(f"\n🔌 PCIe Link:")
-        print(f"   {pcie_info}")
+        print(f"   Gen{gen} x{width}")
         
-        if "16" in pcie_info:
+        if width < MIN_LINK_WIDTH:
+            print(f"   ❌ Link too narrow! Check slot, gold fingers and riser")
+            return False
+        elif width >= FULL_LINK_WIDTH:
             print(f"   ✓ PCIe x16 (full bandwidth)")
         else:
             print(f"   ⚠️  Not running at x16 (may impact performance)")
-    except:
+    else:
         print(f"\n⚠️  Could not read PCIe info")
     
     print("\n" + "=" * 60)
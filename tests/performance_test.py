@@ -3,7 +3,8 @@
 
 import torch
 import sys
-import time
+
+from gpu_backend import get_backend
 
 def performance_benchmark():
     """Run performance benchmarks for FP32 and FP16"""
@@ -12,12 +13,14 @@ def performance_benchmark():
     print("PERFORMANCE BENCHMARK")
     print("=" * 60)
     
-    if not torch.cuda.is_available():
+    backend = get_backend()
+    
+    if not backend.is_available():
         print("❌ CUDA not available!")
         return False
     
-    device = torch.device("cuda:0")
-    gpu_name = torch.cuda.get_device_name(0)
+    device = backend.device()
+    gpu_name = backend.get_device_name()
     
     print(f"\n🔧 GPU: {gpu_name}")
     print("-" * 60)
@@ -32,20 +35,21 @@ def performance_benchmark():
     print(f"   Size: {size}x{size}")
     print(f"   Iterations: {iterations}")
     
-    a = torch.randn(size, size, device=device, dtype=torch.float32)
-    b = torch.randn(size, size, device=device, dtype=torch.float32)
+    dim = backend.scale_dim(size)
+    a = torch.randn(dim, dim, device=device, dtype=torch.float32)
+    b = torch.randn(dim, dim, device=device, dtype=torch.float32)
     
     # Warmup
     for _ in range(5):
-        _ = torch.matmul(a, b)
-    torch.cuda.synchronize()
+        _ = backend.matmul(a, b)
+    backend.synchronize()
     
     # Benchmark
-    start = time.time()
+    start = backend.time()
     for _ in range(iterations):
-        c = torch.matmul(a, b)
-    torch.cuda.synchronize()
-    elapsed = time.time() - start
+        c = backend.matmul(a, b)
+    backend.synchronize()
+    elapsed = backend.time() - start
     
     # Calculate TFLOPS
     flops = 2 * size ** 3 * iterations
@@ -67,26 +71,26 @@ def performance_benchmark():
         print(f"   ❌ LOW (<20 TFLOPS)")
     
     del a, b, c
-    torch.cuda.empty_cache()
+    backend.empty_cache()
     
     # Test 2: FP16 with Tensor Cores
     print("\n2️⃣  FP16 Matrix Multiplication (Tensor Cores)")
     
-    a16 = torch.randn(size, size, device=device, dtype=torch.float16)
-    b16 = torch.randn(size, size, device=device, dtype=torch.float16)
+    a16 = torch.randn(dim, dim, device=device, dtype=torch.float16)
+    b16 = torch.randn(dim, dim, device=device, dtype=torch.float16)
     
     # Warmup
     for _ in range(5):
-        _ = torch.matmul(a16, b16)
-    torch.cuda.synchronize()
+        _ = backend.matmul(a16, b16)
+    backend.synchronize()
     
     # Benchmark
     iterations = 40
-    start = time.time()
+    start = backend.time()
     for _ in range(iterations):
-        c16 = torch.matmul(a16, b16)
-    torch.cuda.synchronize()
-    elapsed = time.time() - start
+        c16 = backend.matmul(a16, b16)
+    backend.synchronize()
+    elapsed = backend.time() - start
     
     # Calculate TFLOPS
     flops = 2 * size ** 3 * iterations
@@ -108,7 +112,7 @@ def performance_benchmark():
         print(f"   ❌ LOW (<60 TFLOPS)")
     
     del a16, b16, c16
-    torch.cuda.empty_cache()
+    backend.empty_cache()
     
     # Test 3: Memory Bandwidth
     print("\n3️⃣  Memory Bandwidth Test")
@@ -116,21 +120,21 @@ def performance_benchmark():
     size_mb = 2000  # 2GB
     elements = int(size_mb * 1024 * 1024 / 4)  # float32 = 4 bytes
     
-    a_mem = torch.randn(elements, dtype=torch.float32, device=device)
+    a_mem = torch.randn(backend.scale_elements(elements), dtype=torch.float32, device=device)
     b_mem = torch.zeros_like(a_mem)
     
     # Warmup
     for _ in range(5):
-        b_mem.copy_(a_mem)
-    torch.cuda.synchronize()
+        backend.copy_(b_mem, a_mem)
+    backend.synchronize()
     
     # Benchmark
     iterations = 50
-    start = time.time()
+    start = backend.time()
     for _ in range(iterations):
-        b_mem.copy_(a_mem)
-    torch.cuda.synchronize()
-    elapsed = time.time() - start
+        backend.copy_(b_mem, a_mem)
+    backend.synchronize()
+    elapsed = backend.time() - start
     
     # Calculate bandwidth
     bytes_transferred = elements * 4 * iterations
@@ -151,7 +155,7 @@ def performance_benchmark():
         print(f"   ❌ LOW (<400 GB/s)")
     
     del a_mem, b_mem
-    torch.cuda.empty_cache()
+    backend.empty_cache()
     
     # Overall evaluation
     print("\n" + "=" * 60)
@@ -198,6 +202,51 @@ def performance_benchmark():
         print("=" * 60)
         return 1
 
+def quick_gemm_check(check_size=2048, bench_size=8192, iterations=5):
+    """
+    Quick GEMM check - verify a matmul against the CPU and time a short run
+    
+    Args:
+        check_size: Matrix size compared against the CPU result
+        bench_size: Matrix size for the short FP32 timing run
+        iterations: Timed iterations
+    
+    Returns:
+        (relative error vs CPU, FP32 TFLOPS)
+    """
+    backend = get_backend()
+    device = backend.device()
+    
+    # Correctness: GPU result vs CPU reference
+    dim = backend.scale_dim(check_size)
+    a = torch.randn(dim, dim, dtype=torch.float32)
+    b = torch.randn(dim, dim, dtype=torch.float32)
+    expected = torch.matmul(a, b)
+    result = backend.matmul(a.to(device), b.to(device))
+    backend.inject_faults(result)
+    actual = result.cpu()
+    rel_error = ((actual - expected).abs().max() / expected.abs().max()).item()
+    del a, b, expected, result, actual
+    
+    # Throughput: short FP32 run
+    dim = backend.scale_dim(bench_size)
+    a = torch.randn(dim, dim, device=device, dtype=torch.float32)
+    b = torch.randn(dim, dim, device=device, dtype=torch.float32)
+    _ = backend.matmul(a, b)  # Warmup
+    backend.synchronize()
+    
+    start = backend.time()
+    for _ in range(iterations):
+        c = backend.matmul(a, b)
+    backend.synchronize()
+    elapsed = backend.time() - start
+    tflops = (2 * bench_size ** 3 * iterations / elapsed) / 1e12
+    
+    del a, b, c
+    backend.empty_cache()
+    
+    return rel_error, tflops
+
 if __name__ == "__main__":
     try:
         result = performance_benchmark()
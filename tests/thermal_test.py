@@ -2,21 +2,14 @@
 """Thermal Stress Test - Check cooling and temperature limits"""
 
 import torch
-import subprocess
 import argparse
 import sys
-import time
+
+from gpu_backend import get_backend
 
 def get_temperature():
     """Get current GPU temperature"""
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=temperature.gpu", "--format=csv,noheader"],
-            capture_output=True, text=True, check=True
-        )
-        return int(result.stdout.strip())
-    except:
-        return None
+    return get_backend().temperature()
 
 def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
     """
@@ -31,12 +24,14 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
     print("THERMAL STRESS TEST")
     print("=" * 60)
     
-    if not torch.cuda.is_available():
+    backend = get_backend()
+    
+    if not backend.is_available():
         print("❌ CUDA not available!")
         return False
     
-    device = torch.device("cuda:0")
-    gpu_name = torch.cuda.get_device_name(0)
+    device = backend.device()
+    gpu_name = backend.get_device_name()
     
     print(f"\n🔧 GPU: {gpu_name}")
     print(f"⏱️  Duration: {duration_minutes} minutes")
@@ -54,8 +49,9 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
     
     try:
         # Allocate tensors
-        tensor_a = torch.randn(size, size, device=device, dtype=torch.float32)
-        tensor_b = torch.randn(size, size, device=device, dtype=torch.float32)
+        dim = backend.scale_dim(size)
+        tensor_a = torch.randn(dim, dim, device=device, dtype=torch.float32)
+        tensor_b = torch.randn(dim, dim, device=device, dtype=torch.float32)
         
         print(f"   ✓ Workload created ({size}x{size} matrices)")
         
@@ -63,7 +59,7 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
         print(f"\n2️⃣  Running thermal stress test...")
         print("   Monitoring temperature every 10 seconds\n")
         
-        start_time = time.time()
+        start_time = backend.time()
         test_duration = duration_minutes * 60
         iterations = 0
         
@@ -71,11 +67,11 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
         temps = []
         throttled = False
         
-        while (time.time() - start_time) < test_duration:
+        while (backend.time() - start_time) < test_duration:
             # Compute-intensive operations
             for _ in range(50):
-                result = torch.matmul(tensor_a, tensor_b)
-                result = torch.matmul(result, tensor_b)
+                result = backend.matmul(tensor_a, tensor_b)
+                result = backend.matmul(result, tensor_b)
             
             iterations += 1
             
@@ -86,7 +82,7 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
                     temps.append(current_temp)
                     max_temp = max(max_temp, current_temp)
                     
-                    elapsed = time.time() - start_time
+                    elapsed = backend.time() - start_time
                     progress = (elapsed / test_duration) * 100
                     
                     # Temperature indicator
@@ -140,11 +136,11 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
         
         # Cleanup
         del tensor_a, tensor_b, result
-        torch.cuda.empty_cache()
+        backend.empty_cache()
         
         # Cool down
         print("\n🧊 Cooling down (10 seconds)...")
-        time.sleep(10)
+        backend.sleep(10)
         
         final_temp = get_temperature()
         if final_temp:
@@ -154,7 +150,7 @@ def thermal_stress_test(duration_minutes=3, temp_limit_gpu=85):
         
     except Exception as e:
         print(f"\n❌ ERROR: {str(e)}")
-        torch.cuda.empty_cache()
+        backend.empty_cache()
         return 1
 
 if __name__ == "__main__":
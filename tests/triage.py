@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Triage - Run cheap checks first and escalate to full stress only if the card survives
+
+Tier 0: identity, VRAM capacity, PCIe link, idle temperature (seconds)
+Tier 1: quick VRAM pattern pass + quick GEMM check (about a minute)
+Tier 2: full VRAM, thermal and performance tests (~10 minutes)
+
+Stops at the first definitive FAIL and reports which tier decided it.
+"""
+
+import argparse
+import math
+import sys
+
+from gpu_backend import get_backend
+from gpu_info import (EXPECTED_MODEL, MIN_VRAM_GB, IDLE_TEMP_HIGH,
+                      FULL_LINK_WIDTH, MIN_LINK_WIDTH)
+from vram_test import vram_stress_test, memory_pattern_test
+from thermal_test import thermal_stress_test, get_temperature
+from performance_test import performance_benchmark, quick_gemm_check
+
+PASS, FAIL, WARNING = 0, 1, 2
+STATUS = {PASS: "✅ PASS", WARNING: "⚠️  WARNING", FAIL: "❌ FAIL"}
+
+def as_exit_code(result):
+    """Normalize test results (True/False or 0/1/2) to an exit code"""
+    if result is True:
+        return PASS
+    if result is False:
+        return FAIL
+    return int(result)
+
+# Tier 0 - identity, capacity and link
+
+def check_identity():
+    gpu_name = get_backend().get_device_name()
+    if EXPECTED_MODEL not in gpu_name:
+        return WARNING, f"Expected RTX 3090, got {gpu_name}"
+    return PASS, gpu_name
+
+def check_capacity():
+    vram_gb = get_backend().total_memory() / 1e9
+    if vram_gb < MIN_VRAM_GB:
+        return FAIL, f"VRAM too low! Expected 24GB, got {vram_gb:.2f}GB"
+    return PASS, f"{vram_gb:.2f} GB"
+
+def check_link():
+    link = get_backend().pcie_link()
+    if link is None:
+        return WARNING, "Could not read PCIe info"
+    gen, width = link
+    if width < MIN_LINK_WIDTH:
+        return FAIL, f"Gen{gen} x{width} - link too narrow (damaged slot/fingers or riser)"
+    if width < FULL_LINK_WIDTH:
+        return WARNING, f"Gen{gen} x{width} - not running at x16"
+    return PASS, f"Gen{gen} x{width}"
+
+def check_idle_temperature():
+    temp = get_temperature()
+    if temp is None:
+        return WARNING, "Could not read temperature"
+    if temp > IDLE_TEMP_HIGH:
+        return WARNING, f"{temp}°C - high idle temperature"
+    return PASS, f"{temp}°C"
+
+# Tier 1 - short memory pattern pass and quick GEMM
+
+def check_memory_patterns(size_gb=4):
+    errors = memory_pattern_test(size_gb)
+    if errors:
+        return FAIL, f"{errors} bit errors in pattern pass - DO NOT BUY!"
+    return PASS, f"0 errors in {size_gb} GB"
+
+def check_quick_gemm():
+    rel_error, tflops = quick_gemm_check()
+    if not math.isfinite(rel_error) or rel_error > 1e-2:  # NaN/Inf output is a failure too
+        return FAIL, f"GEMM result wrong (relative error {rel_error:.2e})"
+    if tflops < 20:
+        return WARNING, f"{tflops:.1f} TFLOPS in short run (expected >20)"
+    return PASS, f"{tflops:.1f} TFLOPS, error {rel_error:.1e}"
+
+def build_tiers(vram_duration=5, vram_size=20, thermal_duration=3, pattern_gb=4):
+    """Tiers as (name, [(check name, check function), ...])"""
+    return [
+        ("Tier 0 - Identity & Link", [
+            ("Identity", check_identity),
+            ("VRAM capacity", check_capacity),
+            ("PCIe link", check_link),
+            ("Idle temperature", check_idle_temperature),
+        ]),
+        ("Tier 1 - Quick Memory & Compute", [
+            ("Memory patterns", lambda: check_memory_patterns(pattern_gb)),
+            ("Quick GEMM", check_quick_gemm),
+        ]),
+        ("Tier 2 - Full Stress", [
+            ("VRAM stress", lambda: (as_exit_code(vram_stress_test(vram_duration, vram_size)), "")),
+            ("Thermal stress", lambda: (as_exit_code(thermal_stress_test(thermal_duration)), "")),
+            ("Performance", lambda: (as_exit_code(performance_benchmark()), "")),
+        ]),
+    ]
+
+def triage(tiers, max_tier=None):
+    """
+    Run tiers in order, stopping at the first FAIL
+
+    Args:
+        tiers: Output of build_tiers()
+        max_tier: Stop after this tier index even if everything passed
+
+    Returns:
+        0 = pass, 1 = fail, 2 = warning
+    """
+
+    print("=" * 60)
+    print("TRIAGE")
+    print("=" * 60)
+
+    backend = get_backend()
+
+    if not backend.is_available():
+        print("❌ CUDA not available!")
+        return FAIL
+
+    total_start = backend.time()
+    warnings = []
+    verdict_tier = None
+    failure = None
+    last_tier = len(tiers) - 1 if max_tier is None else min(max_tier, len(tiers) - 1)
+
+    for tier_name, checks in tiers[:last_tier + 1]:
+        print(f"\n▶️  {tier_name}")
+        print("-" * 60)
+        tier_start = backend.time()
+
+        for check_name, check in checks:
+            check_start = backend.time()
+            try:
+                code, detail = check()
+            except Exception as e:
+                code, detail = FAIL, f"{type(e).__name__}: {str(e)}"
+            elapsed = backend.time() - check_start
+
+            print(f"   {check_name:<18} {STATUS.get(code, STATUS[FAIL]):<12} {detail} ({elapsed:.1f}s)")
+
+            if code == WARNING:
+                warnings.append(f"{check_name}: {detail}" if detail else check_name)
+            elif code != PASS:
+                failure = f"{check_name}: {detail}" if detail else check_name
+                break
+
+        print(f"   Tier time: {backend.time() - tier_start:.1f}s")
+
+        verdict_tier = tier_name
+        if failure:
+            break
+
+    backend.empty_cache()
+
+    # Results
+    total = backend.time() - total_start
+    print("\n" + "=" * 60)
+    print("TRIAGE SUMMARY")
+    print("=" * 60)
+    print(f"Decided by: {verdict_tier}")
+    print(f"Total time: {total/60:.1f} minutes")
+
+    if failure:
+        print(f"\n❌ TRIAGE: FAIL")
+        print(f"❌ {failure}")
+        print("❌ Remaining tiers skipped - DO NOT BUY THIS GPU")
+        result_code = FAIL
+    elif warnings:
+        print(f"\n⚠️  TRIAGE: WARNING")
+        for warning in warnings:
+            print(f"   - {warning}")
+        result_code = WARNING
+    else:
+        print(f"\n✅ TRIAGE: PASS")
+        result_code = PASS
+
+    if max_tier is not None and last_tier < len(tiers) - 1 and not failure:
+        print(f"⚠️  Stopped after {tiers[last_tier][0]} (--max-tier) - not a full test")
+
+    print("=" * 60)
+
+    return result_code
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RTX 3090 Tiered Triage")
+    parser.add_argument("--max-tier", type=int, default=None, choices=[0, 1, 2],
+                        help="Stop after this tier (default: run all tiers)")
+    parser.add_argument("--pattern-size", type=int, default=4,
+                        help="VRAM checked by the tier 1 pattern pass in GB (default: 4)")
+    parser.add_argument("--vram-duration", type=int, default=5,
+                        help="Tier 2 VRAM stress duration in minutes (default: 5)")
+    parser.add_argument("--vram-size", type=int, default=20,
+                        help="Tier 2 VRAM stress size in GB (default: 20)")
+    parser.add_argument("--thermal-duration", type=int, default=3,
+                        help="Tier 2 thermal test duration in minutes (default: 3)")
+
+    args = parser.parse_args()
+
+    tiers = build_tiers(args.vram_duration, args.vram_size,
+                        args.thermal_duration, args.pattern_size)
+
+    try:
+        result = triage(tiers, args.max_tier)
+        sys.exit(result)
+    except KeyboardInterrupt:
+        print(f"\n\n⚠️  Triage interrupted by user")
+        sys.exit(1)
@@ -4,7 +4,8 @@
 import torch
 import argparse
 import sys
-import time
+
+from gpu_backend import get_backend
 
 def vram_stress_test(duration_minutes=5, size_gb=20):
     """
@@ -22,18 +23,20 @@ def vram_stress_test(duration_minutes=5, size_gb=20):
     print("⚠️  ANY errors = DO NOT BUY the GPU")
     print("")
     
-    if not torch.cuda.is_available():
+    backend = get_backend()
+    
+    if not backend.is_available():
         print("❌ CUDA not available!")
         return False
     
-    device = torch.device("cuda:0")
-    gpu_name = torch.cuda.get_device_name(0)
-    total_vram = torch.cuda.get_device_properties(0).total_memory / 1e9
+    device = backend.device()
+    gpu_name = backend.get_device_name()
+    total_vram = backend.total_memory() / 1e9
     
     # Get current VRAM usage
-    torch.cuda.empty_cache()
-    allocated_vram = torch.cuda.memory_allocated(0) / 1e9
-    reserved_vram = torch.cuda.memory_reserved(0) / 1e9
+    backend.empty_cache()
+    allocated_vram = backend.memory_allocated() / 1e9
+    reserved_vram = backend.memory_reserved() / 1e9
     free_vram = total_vram - reserved_vram
     
     print(f"🔧 GPU: {gpu_name}")
@@ -84,54 +87,79 @@ def vram_stress_test(duration_minutes=5, size_gb=20):
     tensor_a = None
     tensor_b = None
     result = None
+    reserved_bytes = 0
     
     try:
         # Allocate tensors
         print("1️⃣  Allocating VRAM...")
-        tensor_a = torch.randn(usable_per_tensor, dtype=torch.float32, device=device)
-        print(f"   ✓ Allocated tensor A: {torch.cuda.memory_allocated()/1e9:.2f} GB")
+        elements = backend.scale_elements(usable_per_tensor)
+        
+        backend.reserve(usable_per_tensor * 4)
+        reserved_bytes += usable_per_tensor * 4
+        tensor_a = torch.randn(elements, dtype=torch.float32, device=device)
+        print(f"   ✓ Allocated tensor A: {backend.memory_allocated()/1e9:.2f} GB")
         
-        tensor_b = torch.randn(usable_per_tensor, dtype=torch.float32, device=device)
-        print(f"   ✓ Allocated tensor B: {torch.cuda.memory_allocated()/1e9:.2f} GB")
+        backend.reserve(usable_per_tensor * 4)
+        reserved_bytes += usable_per_tensor * 4
+        tensor_b = torch.randn(elements, dtype=torch.float32, device=device)
+        print(f"   ✓ Allocated tensor B: {backend.memory_allocated()/1e9:.2f} GB")
         
         # Pre-allocate result tensor to reuse (saves memory)
+        backend.reserve(usable_per_tensor * 4)
+        reserved_bytes += usable_per_tensor * 4
         result = torch.zeros_like(tensor_a)
-        print(f"   ✓ Allocated result buffer: {torch.cuda.memory_allocated()/1e9:.2f} GB")
+        print(f"   ✓ Allocated result buffer: {backend.memory_allocated()/1e9:.2f} GB")
         
-        allocated = torch.cuda.memory_allocated() / 1e9
-        reserved = torch.cuda.memory_reserved() / 1e9
+        allocated = backend.memory_allocated() / 1e9
+        reserved = backend.memory_reserved() / 1e9
         
         print(f"\n   Total Allocated: {allocated:.2f} GB")
         print(f"   Total Reserved: {reserved:.2f} GB")
         
+        # Integer checksums of the inputs - they must never change
+        checksum_a = tensor_a.view(torch.int32).sum().item()
+        checksum_b = tensor_b.view(torch.int32).sum().item()
+        
         # Stress test loop
         print(f"\n2️⃣  Running stress test for {duration_minutes} minutes...")
         print("   Press Ctrl+C to stop early\n")
         
-        start_time = time.time()
+        start_time = backend.time()
         test_duration = duration_minutes * 60
         
-        while (time.time() - start_time) < test_duration:
+        while (backend.time() - start_time) < test_duration:
             # Perform computations - use in-place operations to save memory
             torch.add(tensor_a, tensor_b, out=result)  # result = a + b (in-place)
             result.mul_(2.0)                           # result *= 2 (in-place)
             result.abs_()                              # result = abs(result) (in-place)
             result.sqrt_()                             # result = sqrt(result) (in-place)
+            backend.inject_faults(tensor_a)
             
             # More intensive operation every 10 iterations
             if iterations % 10 == 0:
                 # Use smaller matrices to avoid OOM
-                small_a = torch.randn(4000, 4000, device=device)
-                small_b = torch.randn(4000, 4000, device=device)
-                _ = torch.matmul(small_a, small_b)
+                dim = backend.scale_dim(4000)
+                small_a = torch.randn(dim, dim, device=device)
+                small_b = torch.randn(dim, dim, device=device)
+                _ = backend.matmul(small_a, small_b)
                 del small_a, small_b
-                torch.cuda.empty_cache()
+                backend.empty_cache()
             
             iterations += 1
             
             # Progress report every 30 seconds
             if iterations % 100 == 0:
-                elapsed = time.time() - start_time
+                # Verify inputs still read back as written
+                if tensor_a.view(torch.int32).sum().item() != checksum_a:
+                    errors += 1
+                    checksum_a = tensor_a.view(torch.int32).sum().item()
+                    print(f"   ❌ Data corruption in tensor A (iteration {iterations})")
+                if tensor_b.view(torch.int32).sum().item() != checksum_b:
+                    errors += 1
+                    checksum_b = tensor_b.view(torch.int32).sum().item()
+                    print(f"   ❌ Data corruption in tensor B (iteration {iterations})")
+                
+                elapsed = backend.time() - start_time
                 remaining = test_duration - elapsed
                 progress = (elapsed / test_duration) * 100
                 
@@ -141,7 +169,7 @@ def vram_stress_test(duration_minutes=5, size_gb=20):
             
             # Small delay to prevent 100% utilization
             if iterations % 10 == 0:
-                time.sleep(0.05)
+                backend.sleep(0.05)
         
         print(f"\n3️⃣  Test completed!")
         print(f"   Total iterations: {iterations}")
@@ -220,9 +248,74 @@ def vram_stress_test(duration_minutes=5, size_gb=20):
             del tensor_b
         if result is not None:
             del result
-        torch.cuda.empty_cache()
+        backend.release(reserved_bytes)
+        backend.empty_cache()
         print("   ✓ VRAM cleaned")
 
+# Bit patterns for the quick pattern pass (as unsigned 32-bit words)
+PATTERNS = [0x00000000, 0xFFFFFFFF, 0xAAAAAAAA, 0x55555555]
+
+def memory_pattern_test(size_gb=4, chunk_elements=64_000_000):
+    """
+    Quick VRAM pattern pass - write known values and read them back
+    
+    Fills a buffer with solid and alternating bit patterns, then with each
+    word's own address (catches addressing faults), and counts every word
+    that does not read back as written. Much shorter than the stress test
+    but finds gross bit errors within a minute.
+    
+    Args:
+        size_gb: Amount of VRAM to check (GB)
+        chunk_elements: Words compared at a time (limits temporary memory)
+    
+    Returns:
+        Number of mismatched 32-bit words
+    """
+    backend = get_backend()
+    device = backend.device()
+    words = int(size_gb * 1e9 / 4)  # int32 = 4 bytes
+    elements = backend.scale_elements(words)
+    backend.reserve(words * 4)
+    buffer = None
+    errors = 0
+    
+    try:
+        buffer = torch.empty(elements, dtype=torch.int32, device=device)
+        
+        for pattern in PATTERNS:
+            value = pattern - (1 << 32) if pattern >= (1 << 31) else pattern  # As signed int32
+            buffer.fill_(value)
+            backend.inject_faults(buffer)
+            backend.synchronize()
+            mismatches = 0
+            for start in range(0, elements, chunk_elements):
+                end = min(start + chunk_elements, elements)
+                mismatches += int((buffer[start:end] != value).sum().item())
+            errors += mismatches
+            print(f"   Pattern 0x{pattern:08X}: {mismatches} errors")
+        
+        # Address-in-address: every word holds its own index
+        for start in range(0, elements, chunk_elements):
+            end = min(start + chunk_elements, elements)
+            buffer[start:end].copy_(torch.arange(start, end, dtype=torch.int32, device=device))
+        backend.inject_faults(buffer)
+        backend.synchronize()
+        
+        mismatches = 0
+        for start in range(0, elements, chunk_elements):
+            end = min(start + chunk_elements, elements)
+            expected = torch.arange(start, end, dtype=torch.int32, device=device)
+            mismatches += int((buffer[start:end] != expected).sum().item())
+        errors += mismatches
+        print(f"   Address pattern: {mismatches} errors")
+        
+        return errors
+    
+    finally:
+        del buffer
+        backend.release(words * 4)
+        backend.empty_cache()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="RTX 3090 VRAM Stress Test")
     parser.add_argument("--duration", type=int, default=5, 